@@ -2,9 +2,9 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import numpy as np
 from datetime import datetime
 import base64
+from utils.data_loader import carregar_dados as load_data
 
 # Configuração da página
 st.set_page_config(
@@ -40,15 +40,7 @@ st.markdown(f"""
 # Função para carregar os dados
 @st.cache_data
 def carregar_dados():
-    df = pd.read_excel('data/Dados_POR MUNICIPIO_2020_2025.xlsx', sheet_name='Resultado')
-    
-    # Adicionar colunas calculadas
-    df['Valor por kg'] = df['Valor US$ FOB'] / df['Quilograma Líquido'].replace(0, np.nan)
-    
-    # Converter tipos de dados se necessário
-    df['Ano'] = df['Ano'].astype(int)
-    
-    return df
+    return load_data()
 
 # Carregar os dados
 try:
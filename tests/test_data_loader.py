@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from utils.data_loader import ARQUIVO_DADOS, carregar_dados
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLANILHA = os.path.join(RAIZ, ARQUIVO_DADOS)
+
+
+def carregar_com_read_excel(caminho, aba='Resultado'):
+    """Caminho antigo de carregamento, usado como referência."""
+    df = pd.read_excel(caminho, sheet_name=aba)
+    df['Valor por kg'] = df['Valor US$ FOB'] / df['Quilograma Líquido'].replace(0, np.nan)
+    df['Ano'] = df['Ano'].astype(int)
+    return df
+
+
+# Com blocos de 5 linhas, 'Código SH4' começa numérica e passa a ter textos
+# como '0303' em blocos seguintes.
+@pytest.mark.parametrize('tamanho_bloco', [5, 1000, 20_000])
+def test_planilha_do_projeto_igual_ao_read_excel(tamanho_bloco):
+    esperado = carregar_com_read_excel(PLANILHA)
+    obtido = carregar_dados(PLANILHA, tamanho_bloco=tamanho_bloco)
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+
+def _salvar(caminho, linhas, aba='Resultado'):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = aba
+    for linha in linhas:
+        ws.append(linha)
+    wb.save(caminho)
+
+
+@pytest.mark.parametrize('tamanho_bloco', [1, 2, 100])
+def test_tipos_e_cabecalho_iguais_ao_read_excel(tmp_path, tamanho_bloco):
+    caminho = tmp_path / 'dados.xlsx'
+    _salvar(caminho, [
+        ['Ano', 'Mês', 'Código', None, 'Código', 'Valor US$ FOB', 'Quilograma Líquido'],
+        [2024, 1, 1, 'a', 'x', 10, 2],
+        [2024, 2, 2.5, 'b', None, 20, 0],
+        [2025, 3, None, 'c', 'y', 30, 5],
+        [2025, 4, '0303', 'd', True, 40, 8],
+        [2025, 5, 1.0, 'e', 1, 50, 10],
+    ])
+    esperado = carregar_com_read_excel(caminho)
+    obtido = carregar_dados(caminho, tamanho_bloco=tamanho_bloco)
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+
+def test_aba_so_com_cabecalho(tmp_path):
+    caminho = tmp_path / 'dados.xlsx'
+    _salvar(caminho, [['Ano', 'Fluxo', 'Valor US$ FOB', 'Quilograma Líquido']])
+    df = carregar_dados(caminho)
+    assert df.empty
+    assert list(df.columns) == ['Ano', 'Fluxo', 'Valor US$ FOB', 'Quilograma Líquido', 'Valor por kg']
+
+
+def test_aba_vazia(tmp_path):
+    caminho = tmp_path / 'dados.xlsx'
+    _salvar(caminho, [])
+    with pytest.raises(ValueError):
+        carregar_dados(caminho)
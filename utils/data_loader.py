@@ -1,16 +1,161 @@
 # utils/data_loader.py
 import pandas as pd
 import numpy as np
+from openpyxl import load_workbook
+
+ARQUIVO_DADOS = 'data/Dados_POR MUNICIPIO_2020_2025.xlsx'
+
+TAMANHO_BLOCO = 20_000
+
+
+def _eh_numerico(valores):
+    return all(valor is None or (isinstance(valor, (int, float)) and not isinstance(valor, bool))
+               for valor in valores)
+
+
+def _bloco_para_colunas(linhas, cabecalho):
+    """Converte um bloco de linhas em arrays por coluna.
+
+    Colunas só com números (ou vazias) viram arrays float64; as demais ficam
+    como tuplas e são codificadas por dicionário em carregar_dados().
+    """
+    n_colunas = len(cabecalho)
+    colunas = list(zip(*(tuple(linha[:n_colunas]) + (None,) * (n_colunas - len(linha)) for linha in linhas)))
+    bloco = {}
+    for nome, valores in zip(cabecalho, colunas):
+        if _eh_numerico(valores):
+            bloco[nome] = np.array(valores, dtype=np.float64)
+        else:
+            bloco[nome] = valores
+    return bloco
+
+
+def _nomes_colunas(cabecalho):
+    """Nomeia o cabeçalho como o pd.read_excel: 'Unnamed: N' e 'Nome.1'."""
+    while cabecalho and cabecalho[-1] is None:
+        cabecalho = cabecalho[:-1]
+    nomes = []
+    contagem = {}
+    for i, nome in enumerate(cabecalho):
+        if nome is None:
+            nome = f'Unnamed: {i}'
+        base = nome
+        while nome in contagem:
+            contagem[base] += 1
+            nome = f'{base}.{contagem[base]}'
+        contagem.setdefault(base, 0)
+        contagem.setdefault(nome, 0)
+        nomes.append(nome)
+    return nomes
+
+
+def _calcular_colunas(bloco):
+    """Adiciona ao bloco a coluna calculada 'Valor por kg'."""
+    kg = bloco['Quilograma Líquido']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bloco['Valor por kg'] = bloco['Valor US$ FOB'] / np.where(kg == 0, np.nan, kg)
+    return bloco
+
+
+def ler_planilha_em_blocos(caminho=ARQUIVO_DADOS, aba='Resultado', tamanho_bloco=TAMANHO_BLOCO):
+    """Lê a aba em modo somente leitura, devolvendo um bloco de colunas por vez.
+
+    O primeiro item devolvido é a lista de colunas do cabeçalho; os seguintes
+    são os blocos, cada um já com a coluna calculada 'Valor por kg'.
+    """
+    wb = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        linhas = wb[aba].iter_rows(values_only=True)
+        primeira = next(linhas, None)
+        if primeira is None or all(valor is None for valor in primeira):
+            raise ValueError(f"A aba '{aba}' de {caminho} está vazia ou sem cabeçalho")
+        cabecalho = _nomes_colunas(list(primeira))
+        yield cabecalho
+
+        buffer = []
+        for linha in linhas:
+            if all(valor is None for valor in linha):
+                continue
+            buffer.append(linha)
+            if len(buffer) == tamanho_bloco:
+                yield _calcular_colunas(_bloco_para_colunas(buffer, cabecalho))
+                buffer = []
+        if buffer:
+            yield _calcular_colunas(_bloco_para_colunas(buffer, cabecalho))
+    finally:
+        wb.close()
+
+
+def _numeros_para_valores(valores):
+    """Volta um array float64 para uma lista de valores de célula."""
+    return [np.nan if np.isnan(valor) else valor for valor in valores.tolist()]
+
+
+def _valor_celula(valor):
+    """Normaliza a célula como o pd.read_excel: vazia vira NaN e float inteiro vira int."""
+    if valor is None:
+        return np.nan
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+def _codificar(valores, dicionario):
+    """Codifica os valores pelo dicionário da coluna, que guarda o tipo junto.
+
+    Assim 1, 1.0 e True continuam distintos, e células vazias viram NaN.
+    """
+    return np.fromiter(
+        (dicionario.setdefault((type(valor), valor), len(dicionario))
+         for valor in map(_valor_celula, valores)),
+        dtype=np.int32,
+        count=len(valores)
+    )
+
+
+def carregar_dados(caminho=ARQUIVO_DADOS, aba='Resultado', tamanho_bloco=TAMANHO_BLOCO):
+    blocos = ler_planilha_em_blocos(caminho, aba, tamanho_bloco)
+    cabecalho = next(blocos)
+
+    partes = {}
+    dicionarios = {}
+    for bloco in blocos:
+        for nome, valores in bloco.items():
+            if isinstance(valores, np.ndarray) and nome not in dicionarios:
+                partes.setdefault(nome, []).append(valores)
+                continue
+            if nome not in dicionarios:
+                # Coluna com texto: recodificar os blocos que já eram numéricos
+                dicionarios[nome] = {}
+                partes[nome] = [
+                    _codificar(_numeros_para_valores(anterior), dicionarios[nome])
+                    for anterior in partes.get(nome, [])
+                ]
+            if isinstance(valores, np.ndarray):
+                valores = _numeros_para_valores(valores)
+            # Codificar textos pelo dicionário da coluna
+            partes[nome].append(_codificar(valores, dicionarios[nome]))
+
+    if not partes:
+        df = pd.DataFrame(columns=cabecalho + ['Valor por kg'])
+    else:
+        colunas = {}
+        for nome, blocos_coluna in partes.items():
+            valores = np.concatenate(blocos_coluna)
+            partes[nome] = None
+            if nome in dicionarios:
+                categorias = np.empty(len(dicionarios[nome]), dtype=object)
+                categorias[:] = [valor for _, valor in dicionarios[nome]]
+                valores = categorias[valores]
+            elif nome != 'Valor por kg' and not np.isnan(valores).any() and (valores == np.round(valores)).all():
+                # Manter inteiros como int64, como faria o pd.read_excel
+                valores = valores.astype(np.int64)
+            colunas[nome] = valores
+        df = pd.DataFrame(colunas)
 
-def carregar_dados():
-    df = pd.read_excel('data/Dados_POR MUNICIPIO_2020_2025.xlsx', sheet_name='Resultado')
-    
-    # Adicionar colunas calculadas
-    df['Valor por kg'] = df['Valor US$ FOB'] / df['Quilograma Líquido'].replace(0, np.nan)
-    
     # Converter tipos de dados se necessário
     df['Ano'] = df['Ano'].astype(int)
-    
+
     return df
 
 def get_summary_stats(df):
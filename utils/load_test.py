@@ -0,0 +1,428 @@
+# utils/load_test.py
+"""Teste de carga das páginas do dashboard com sessões simultâneas.
+
+Simula N sessões concorrentes, cada uma em seu próprio processo, usando o
+``AppTest`` do Streamlit. Cada sessão navega entre
+``comercio_piaui.py``, ``pages/analise_geografica.py`` e ``pages/Documentos.py``
+repetindo sequências de cliques nos filtros, e ao final é gerado um relatório
+com vazão, latências de rerun (p50/p95/p99), crescimento de memória após o
+aquecimento e taxa de acerto do ``st.cache_data``.
+
+Requer Streamlit >= 1.28 (``streamlit.testing``). Uso, a partir da raiz do
+repositório e sem acesso à rede:
+
+    python -m utils.load_test --sessoes 8 --visitas 5
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGINA_PRINCIPAL = 'comercio_piaui.py'
+PAGINA_GEOGRAFICA = 'pages/analise_geografica.py'
+PAGINA_DOCUMENTOS = 'pages/Documentos.py'
+
+# Peso de cada página na escolha da próxima visita de uma sessão
+PESOS_PAGINAS = {
+    PAGINA_PRINCIPAL: 0.6,
+    PAGINA_GEOGRAFICA: 0.3,
+    PAGINA_DOCUMENTOS: 0.1,
+}
+
+
+def _widget(widgets, label):
+    """Retorna o widget com o rótulo informado."""
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"Widget não encontrado: {label!r}")
+
+
+def _cliques_principal(at, rng):
+    """Sequência de filtros típica do dashboard principal."""
+    # Restringir os anos
+    anos = _widget(at.sidebar.multiselect, "Selecione o(s) ano(s):")
+    todos_anos = [int(ano) for ano in anos.options]
+    anos.set_value(sorted(rng.sample(todos_anos, rng.randint(1, len(todos_anos)))))
+    yield
+
+    # Apenas um tipo de fluxo
+    fluxo = _widget(at.sidebar.multiselect, "Tipo de fluxo:")
+    fluxo.set_value([rng.choice(fluxo.options)])
+    yield
+
+    # Alguns dos principais municípios
+    municipios = _widget(at.sidebar.multiselect, "Selecione o(s) município(s):")
+    opcoes = [m for m in municipios.options if m != 'Todos']
+    municipios.set_value(rng.sample(opcoes, min(len(opcoes), rng.randint(1, 3))))
+    yield
+
+    # Um país
+    paises = _widget(at.sidebar.multiselect, "Selecione o(s) país(es):")
+    opcoes = [p for p in paises.options if p != 'Todos']
+    paises.set_value([rng.choice(opcoes)])
+    yield
+
+    # Limpar municípios e países, voltando para todos os anos
+    _widget(at.sidebar.multiselect, "Selecione o(s) município(s):").set_value([])
+    _widget(at.sidebar.multiselect, "Selecione o(s) país(es):").set_value([])
+    _widget(at.sidebar.multiselect, "Selecione o(s) ano(s):").set_value(todos_anos)
+    yield
+
+
+def _cliques_geografica(at, rng):
+    """Troca de ano e de fluxo na análise geográfica."""
+    for _ in range(3):
+        ano = _widget(at.selectbox, "Selecione o ano:")
+        ano.select_index(rng.randrange(len(ano.options)))
+        yield
+
+    fluxo = _widget(at.selectbox, "Tipo de fluxo:")
+    fluxo.select_index(rng.randrange(len(fluxo.options)))
+    yield
+
+
+def _cliques_documentos(at, rng):
+    """A página de documentos não tem filtros, apenas novas renderizações."""
+    yield
+
+
+CLIQUES = {
+    PAGINA_PRINCIPAL: _cliques_principal,
+    PAGINA_GEOGRAFICA: _cliques_geografica,
+    PAGINA_DOCUMENTOS: _cliques_documentos,
+}
+
+
+def _memoria_mb():
+    """Retorna (RSS atual, pico de RSS) do processo em MB, lidos de /proc."""
+    valores = {}
+    with open('/proc/self/status', encoding='utf-8') as f:
+        for linha in f:
+            campo, _, resto = linha.partition(':')
+            if campo in ('VmRSS', 'VmHWM'):
+                valores[campo] = int(resto.split()[0]) / 1024
+    return valores.get('VmRSS', 0.0), valores.get('VmHWM', 0.0)
+
+
+class ContadorCache:
+    """Conta acertos e faltas do ``st.cache_data`` por função cacheada."""
+
+    def __init__(self):
+        self.acertos = defaultdict(int)
+        self.faltas = defaultdict(int)
+        self.disponivel = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def instalar(self):
+        # Os ganchos de acerto/falta são internos do Streamlit; se a versão
+        # instalada não os tiver, o relatório apenas omite a taxa de acerto.
+        try:
+            from streamlit.runtime.caching import cache_utils
+        except ImportError:
+            return
+        cached_func = getattr(cache_utils, 'CachedFunc', None)
+        if cached_func is None:
+            return
+        if not (hasattr(cached_func, '_handle_cache_hit') and hasattr(cached_func, '_handle_cache_miss')):
+            return
+
+        contador = self
+        original_acerto = cached_func._handle_cache_hit
+        original_falta = cached_func._handle_cache_miss
+
+        def _nome(func):
+            info = getattr(func, '_info', None)
+            alvo = getattr(info, 'func', None)
+            return getattr(alvo, '__qualname__', 'desconhecida')
+
+        def _pilha():
+            if not hasattr(contador._local, 'faltas'):
+                contador._local.faltas = []
+            return contador._local.faltas
+
+        def _handle_cache_hit(func, *args, **kwargs):
+            # Dentro de uma falta, o Streamlit relê o cache após travar a chave
+            # e chama este gancho se outra thread já o preencheu: nesse caso
+            # a chamada conta só como acerto.
+            pilha = _pilha()
+            if pilha:
+                pilha[-1] = True
+            with contador._lock:
+                contador.acertos[_nome(func)] += 1
+            return original_acerto(func, *args, **kwargs)
+
+        def _handle_cache_miss(func, *args, **kwargs):
+            pilha = _pilha()
+            pilha.append(False)
+            try:
+                return original_falta(func, *args, **kwargs)
+            finally:
+                if not pilha.pop():
+                    with contador._lock:
+                        contador.faltas[_nome(func)] += 1
+
+        cached_func._handle_cache_hit = _handle_cache_hit
+        cached_func._handle_cache_miss = _handle_cache_miss
+        self.disponivel = True
+
+    def zerar(self):
+        with self._lock:
+            self.acertos.clear()
+            self.faltas.clear()
+
+
+def _resumo_cache(acertos, faltas):
+    funcoes = {}
+    for nome in sorted(set(acertos) | set(faltas)):
+        acertos_funcao, faltas_funcao = acertos.get(nome, 0), faltas.get(nome, 0)
+        funcoes[nome] = {
+            'acertos': acertos_funcao,
+            'faltas': faltas_funcao,
+            'taxa_acerto': acertos_funcao / (acertos_funcao + faltas_funcao),
+        }
+    total_acertos = sum(acertos.values())
+    total = total_acertos + sum(faltas.values())
+    return {
+        'taxa_acerto': total_acertos / total if total else None,
+        'funcoes': funcoes,
+    }
+
+
+def _visitar(app_test, pagina, rng, args, latencias, erros):
+    """Abre a página e repete a sequência de cliques, medindo cada rerun."""
+    try:
+        at = app_test.from_file(os.path.join(RAIZ, pagina), default_timeout=args.timeout)
+        cliques = CLIQUES[pagina](at, rng)
+        primeiro = True
+        while True:
+            # A primeira execução é a abertura da página; as demais são
+            # reruns disparados pelos cliques nos filtros.
+            if not primeiro:
+                try:
+                    next(cliques)
+                except StopIteration:
+                    break
+            inicio = time.monotonic()
+            at.run()
+            latencias[pagina].append(time.monotonic() - inicio)
+            if len(at.exception) > 0:
+                erros.append(f"{pagina}: {at.exception[0].value}")
+                break
+            primeiro = False
+    except Exception as e:
+        erros.append(f"{pagina}: {type(e).__name__}: {e}")
+
+
+def _sessao(id_sessao, args, barreira):
+    """Executa uma sessão em um processo próprio e devolve suas medições.
+
+    Cada processo aquece o cache visitando uma vez cada página antes de medir
+    a memória de referência e de esperar as demais sessões na barreira.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    # As páginas importam utils.* e abrem arquivos relativos à raiz do projeto
+    os.chdir(RAIZ)
+    if RAIZ not in sys.path:
+        sys.path.insert(0, RAIZ)
+    contador = ContadorCache()
+    contador.instalar()
+
+    rng = random.Random(args.semente + id_sessao)
+    paginas = list(PESOS_PAGINAS)
+    pesos = list(PESOS_PAGINAS.values())
+    latencias = defaultdict(list)
+    erros = []
+
+    for pagina in paginas:
+        _visitar(AppTest, pagina, rng, args, defaultdict(list), erros)
+    contador.zerar()
+    rss_base, _ = _memoria_mb()
+
+    resultado = {
+        'latencias': latencias,
+        'erros': erros,
+        'memoria': {'base': rss_base, 'visitas': []},
+        'inicio': None,
+        'fim': None,
+    }
+    try:
+        barreira.wait(args.timeout_inicio)
+    except Exception as e:
+        erros.append(f"sessão {id_sessao}: outras sessões não iniciaram ({type(e).__name__})")
+        return _finalizar_sessao(resultado, contador)
+
+    resultado['inicio'] = time.monotonic()
+    for _ in range(args.visitas):
+        pagina = rng.choices(paginas, weights=pesos)[0]
+        _visitar(AppTest, pagina, rng, args, latencias, erros)
+        rss, _ = _memoria_mb()
+        resultado['memoria']['visitas'].append(rss)
+    resultado['fim'] = time.monotonic()
+    return _finalizar_sessao(resultado, contador)
+
+
+def _finalizar_sessao(resultado, contador):
+    resultado['latencias'] = dict(resultado['latencias'])
+    resultado['memoria']['pico'] = _memoria_mb()[1]
+    resultado['cache'] = {
+        'disponivel': contador.disponivel,
+        'acertos': dict(contador.acertos),
+        'faltas': dict(contador.faltas),
+    }
+    return resultado
+
+
+def _percentis(latencias):
+    if not latencias:
+        return {'p50': None, 'p95': None, 'p99': None}
+    p50, p95, p99 = np.percentile(np.array(latencias) * 1000, [50, 95, 99])
+    return {'p50': p50, 'p95': p95, 'p99': p99}
+
+
+def _resumo_memoria(sessoes):
+    """Crescimento de RSS de cada sessão a partir da referência pós-aquecimento."""
+    medidas = [s['memoria'] for s in sessoes if s['memoria']['visitas']]
+    if not medidas:
+        return None
+    crescimentos = [m['visitas'][-1] - m['base'] for m in medidas]
+    return {
+        'base_media': float(np.mean([m['base'] for m in medidas])),
+        'min': min(min(m['visitas']) for m in medidas),
+        'max': max(max(m['visitas']) for m in medidas),
+        'final_media': float(np.mean([m['visitas'][-1] for m in medidas])),
+        'crescimento_medio': float(np.mean(crescimentos)),
+        'crescimento_max': max(crescimentos),
+        'pico': max(m['pico'] for m in medidas),
+    }
+
+
+def executar(args):
+    """Roda o teste de carga e retorna o relatório como dicionário.
+
+    Cada sessão roda em um processo separado, porque ``AppTest.run`` altera
+    estado global do Streamlit e não pode ser usado em várias threads ao mesmo
+    tempo. Por isso o cache e a memória são medidos por sessão, não
+    compartilhados como em um único worker.
+    """
+    # Falhar logo se a versão do Streamlit não tiver streamlit.testing
+    from streamlit.testing.v1 import AppTest
+
+    contexto = multiprocessing.get_context('spawn')
+    erros = []
+    sessoes = []
+    with contexto.Manager() as gerenciador:
+        barreira = gerenciador.Barrier(args.sessoes)
+        with ProcessPoolExecutor(max_workers=args.sessoes, mp_context=contexto) as executor:
+            futuros = [executor.submit(_sessao, i, args, barreira) for i in range(args.sessoes)]
+            for i, futuro in enumerate(futuros):
+                try:
+                    sessoes.append(futuro.result())
+                except Exception as e:
+                    erros.append(f"sessão {i}: {type(e).__name__}: {e}")
+
+    latencias = defaultdict(list)
+    acertos = defaultdict(int)
+    faltas = defaultdict(int)
+    cache_disponivel = bool(sessoes) and all(s['cache']['disponivel'] for s in sessoes)
+    for sessao in sessoes:
+        erros.extend(sessao['erros'])
+        for pagina, lats in sessao['latencias'].items():
+            latencias[pagina].extend(lats)
+        for nome, n in sessao['cache']['acertos'].items():
+            acertos[nome] += n
+        for nome, n in sessao['cache']['faltas'].items():
+            faltas[nome] += n
+
+    inicios = [s['inicio'] for s in sessoes if s['inicio'] is not None]
+    fins = [s['fim'] for s in sessoes if s['fim'] is not None]
+    duracao = max(fins) - min(inicios) if inicios and fins else 0.0
+
+    todas = [lat for lats in latencias.values() for lat in lats]
+    return {
+        'sessoes': args.sessoes,
+        'visitas_por_sessao': args.visitas,
+        'duracao_s': duracao,
+        'reruns': len(todas),
+        'vazao_reruns_s': len(todas) / duracao if duracao else None,
+        'latencia_ms': _percentis(todas),
+        'latencia_ms_por_pagina': {
+            pagina: dict(_percentis(lats), reruns=len(lats))
+            for pagina, lats in sorted(latencias.items())
+        },
+        'memoria_mb': _resumo_memoria(sessoes),
+        'cache': _resumo_cache(acertos, faltas) if cache_disponivel else None,
+        'erros': erros,
+    }
+
+
+def _fmt(valor, formato='.1f'):
+    return 'N/A' if valor is None else format(valor, formato)
+
+
+def imprimir_relatorio(relatorio):
+    lat = relatorio['latencia_ms']
+    mem = relatorio['memoria_mb']
+    print(f"Sessões simultâneas: {relatorio['sessoes']} "
+          f"({relatorio['visitas_por_sessao']} visitas cada)")
+    print(f"Duração: {relatorio['duracao_s']:.2f} s | Reruns: {relatorio['reruns']} | "
+          f"Vazão: {_fmt(relatorio['vazao_reruns_s'], '.2f')} reruns/s")
+    print(f"Latência (ms): p50={_fmt(lat['p50'])} p95={_fmt(lat['p95'])} p99={_fmt(lat['p99'])}")
+    for pagina, valores in relatorio['latencia_ms_por_pagina'].items():
+        print(f"  {pagina}: {valores['reruns']} reruns, p50={_fmt(valores['p50'])} "
+              f"p95={_fmt(valores['p95'])} p99={_fmt(valores['p99'])}")
+    if mem is None:
+        print("Memória: nenhuma visita medida")
+    else:
+        print(f"Memória por sessão (MB): base={mem['base_media']:.1f} final={mem['final_media']:.1f} "
+              f"min={mem['min']:.1f} max={mem['max']:.1f} pico={mem['pico']:.1f}")
+        print(f"  crescimento após aquecimento: médio={mem['crescimento_medio']:+.1f} "
+              f"máximo={mem['crescimento_max']:+.1f}")
+
+    cache = relatorio['cache']
+    if cache is None:
+        print("Cache: taxa de acerto indisponível nesta versão do Streamlit")
+    else:
+        taxa = cache['taxa_acerto']
+        print(f"Cache: taxa de acerto={_fmt(None if taxa is None else taxa * 100)}%")
+        for nome, valores in cache['funcoes'].items():
+            print(f"  {nome}: {valores['acertos']} acertos, {valores['faltas']} faltas")
+
+    if relatorio['erros']:
+        print(f"Erros: {len(relatorio['erros'])}")
+        for erro in relatorio['erros'][:10]:
+            print(f"  {erro}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga das páginas do dashboard.")
+    parser.add_argument('--sessoes', type=int, default=4, help="número de sessões simultâneas")
+    parser.add_argument('--visitas', type=int, default=5, help="páginas visitadas por sessão")
+    parser.add_argument('--semente', type=int, default=0, help="semente das sequências de cliques")
+    parser.add_argument('--timeout', type=float, default=120, help="tempo máximo de cada rerun (s)")
+    parser.add_argument('--timeout-inicio', type=float, default=600,
+                        help="tempo máximo de espera pelas demais sessões antes de começar (s)")
+    parser.add_argument('--json', help="grava o relatório também neste arquivo JSON")
+    args = parser.parse_args()
+
+    relatorio = executar(args)
+    imprimir_relatorio(relatorio)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()